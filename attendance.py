@@ -2,16 +2,21 @@ import cv2
 import pandas as pd
 import datetime
 import os
-
-# Load Haar Cascade safely
-face_cascade = cv2.CascadeClassifier("haarcascade_frontalface_default.xml")
-
-if face_cascade.empty():
-    print("❌ Haar cascade not loaded")
+from detectors import get_detector
+from lbph_config import load_model_config, config_pending_retrain, create_recognizer, prepare_face
+
+# Load face detector safely
+try:
+    detector = get_detector(scale_factor=1.2, min_neighbors=5)
+except (IOError, ValueError) as e:
+    print(f"❌ {e}")
     exit()
 
 # Load trained model
-recognizer = cv2.face.LBPHFaceRecognizer_create()
+cfg = load_model_config()
+if config_pending_retrain(cfg):
+    print("⚠ lbph_config.json changed since the last training, run trainer.py to apply it")
+recognizer = create_recognizer(cfg)
 recognizer.read("trainer/trainer.yml")
 
 cam = cv2.VideoCapture(0)
@@ -24,12 +29,12 @@ while True:
         break
 
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.2, 5)
+    faces = detector.detect(gray)
 
     for (x, y, w, h) in faces:
-        id_, confidence = recognizer.predict(gray[y:y+h, x:x+w])
+        id_, confidence = recognizer.predict(prepare_face(gray[y:y+h, x:x+w], cfg))
 
-        if confidence < 70:
+        if confidence < cfg["threshold"]:
             date = datetime.date.today().strftime("%d-%m-%Y")
             time = datetime.datetime.now().strftime("%H:%M:%S")
 
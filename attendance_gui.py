@@ -6,16 +6,18 @@ import json
 import tkinter as tk
 from tkinter import messagebox, ttk
 import subprocess
+from detectors import get_detector, DEFAULT_BACKEND
+from lbph_config import load_model_config, config_pending_retrain, create_recognizer, prepare_face
+from attendance_outbox import AttendanceOutbox, COLLECTOR_URL
 
 # ================= CONFIG =================
 STUDENTS_FILE = "students.csv"
 ATTENDANCE_FILE = "Attendance.csv"
 ADMIN_FILE = "admin.json"
-CASCADE_FILE = "haarcascade_frontalface_default.xml"
+DETECTOR_BACKEND = DEFAULT_BACKEND  # "haar", "lbp" or "haar_fast"
 TRAINER_FILE = os.path.join("trainer", "trainer.yml")
 DATASET_DIR = "dataset"
 
-CONF_THRESHOLD = 65
 CAPTURE_COUNT = 40
 
 # ================= GLOBALS =================
@@ -24,7 +26,9 @@ attendance_run_df = pd.DataFrame(columns=["ID", "Name", "Class", "Date", "Time"]
 running = False
 cam = None
 recognizer = None
-face_cascade = None
+lbph_cfg = None
+face_detector = None
+outbox = None
 root = None
 
 # ================= THEMES (ONLY ADDITION) =================
@@ -104,15 +108,23 @@ def load_students():
 
 # ================= MODEL =================
 def load_models():
-    global face_cascade, recognizer
-    face_cascade = cv2.CascadeClassifier(CASCADE_FILE)
-    recognizer = cv2.face.LBPHFaceRecognizer_create()
+    global face_detector, recognizer, lbph_cfg
+    try:
+        face_detector = get_detector(DETECTOR_BACKEND, scale_factor=1.2, min_neighbors=5)
+    except (IOError, ValueError) as e:
+        messagebox.showerror("Detector", str(e))
+        return False
+    lbph_cfg = load_model_config()
+    recognizer = create_recognizer(lbph_cfg)
 
     if not os.path.exists(TRAINER_FILE):
         messagebox.showwarning("Missing", "Train the model first.")
         return False
 
     recognizer.read(TRAINER_FILE)
+    if config_pending_retrain(lbph_cfg):
+        messagebox.showwarning("Retrain", "LBPH settings were re-tuned since the last "
+                               "training. Using the trained settings until you train the model.")
     return True
 
 # ================= THEME APPLY (ONLY ADDITION) =================
@@ -340,14 +352,18 @@ def capture_dataset_window():
 
     def start():
         sid = int(id_e.get())
+        try:
+            face = get_detector(DETECTOR_BACKEND, scale_factor=1.3, min_neighbors=5)
+        except (IOError, ValueError) as e:
+            messagebox.showerror("Detector", str(e))
+            return
         cam = cv2.VideoCapture(0)
-        face = cv2.CascadeClassifier(CASCADE_FILE)
         count = 0
 
         while True:
             ret,frame = cam.read()
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = face.detectMultiScale(gray,1.3,5)
+            faces = face.detect(gray)
 
             for (x,y,w,h) in faces:
                 count+=1
@@ -384,17 +400,19 @@ def process_frame():
 
     ret,frame = cam.read()
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray,1.2,5)
+    faces = face_detector.detect(gray)
 
     for (x,y,w,h) in faces:
-        id_,conf = recognizer.predict(gray[y:y+h,x:x+w])
+        id_,conf = recognizer.predict(prepare_face(gray[y:y+h,x:x+w],lbph_cfg))
         date = datetime.date.today().strftime("%d-%m-%Y")
         time = datetime.datetime.now().strftime("%H:%M:%S")
 
-        if id_ in students and conf<CONF_THRESHOLD:
+        if id_ in students and conf<lbph_cfg["threshold"]:
             name,cls = students[id_]
             if not ((attendance_run_df["ID"]==id_) & (attendance_run_df["Date"]==date)).any():
                 attendance_run_df.loc[len(attendance_run_df)] = [id_,name,cls,date,time]
+                if outbox is not None:
+                    outbox.publish(id_,name,cls,date,time)
             label=f"{name} [{cls}]"
             color=(0,255,0)
         else:
@@ -455,7 +473,12 @@ def attendance_history_window():
 
 # ================= MAIN =================
 def main_app():
-    global root, _main_card, _main_title, _theme_btn, _registered_buttons
+    global root, outbox, _main_card, _main_title, _theme_btn, _registered_buttons
+    # stream marks to ATTENDANCE_COLLECTOR_URL; also flushes events left from last run
+    if COLLECTOR_URL:
+        outbox = AttendanceOutbox(COLLECTOR_URL)
+        outbox.start()
+
     root=tk.Tk()
     root.title("Face Recognition Attendance System")
     root.geometry("720x720")
@@ -503,6 +526,9 @@ def main_app():
 
     root.mainloop()
 
+    if outbox is not None:
+        outbox.close()
+
 # ================= LOGIN =================
 def login_window():
     win=tk.Tk()
@@ -0,0 +1,276 @@
+"""Non-blocking outbox that ships attendance events to an HTTP collector.
+
+``publish()`` only puts the event on a bounded in-memory queue and never
+takes a lock; if the queue is full the event is dropped and counted. A
+background thread appends queued events to a spool file on disk, then POSTs
+them to the collector in batches as ``{"events": [...]}``.
+
+Delivery progress is a byte offset kept in a small sidecar file
+(``<spool>.offset``), so a sent batch costs one tiny write instead of a spool
+rewrite; the spool is compacted only once the sent prefix grows large.
+Network errors, timeouts, 5xx, 408 and 429 are retried with exponential
+backoff. Other 4xx answers are permanent: that batch goes to
+``<spool>.dead`` and sending continues. Lines that are not valid JSON (e.g.
+left half-written by a crash) go to ``<spool>.bad``. Delivery is
+at-least-once; collectors should de-duplicate on ``event_id``.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+log = logging.getLogger(__name__)
+
+# ================= CONFIG =================
+COLLECTOR_URL = os.environ.get("ATTENDANCE_COLLECTOR_URL", "")
+SPOOL_FILE = "outbox.jsonl"
+
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 2.0     # seconds to wait for a batch to fill up
+QUEUE_SIZE = 1000        # events held in memory before publish() starts dropping
+SEND_TIMEOUT = 5.0
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 300.0
+COMPACT_BYTES = 1 << 20  # rewrite the spool once this much of it has been sent
+
+RETRYABLE_4XX = (408, 429)
+
+
+class AttendanceOutbox:
+    def __init__(self, url=COLLECTOR_URL, spool_file=SPOOL_FILE,
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 queue_size=QUEUE_SIZE, timeout=SEND_TIMEOUT):
+        self.url = url
+        self.spool_file = spool_file
+        self.offset_file = spool_file + ".offset"
+        self.bad_file = spool_file + ".bad"
+        self.dead_file = spool_file + ".dead"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.source = socket.gethostname()
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._unspooled = []     # taken off the queue but not yet on disk
+        self._spool_lock = threading.Lock()  # worker and close() only
+        self._stop = threading.Event()
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        self._thread = None
+
+    # ---------- frame loop side ----------
+    def publish(self, student_id, name, cls, date, time_):
+        """Queue one attendance mark; never waits on the network or the disk."""
+        event = {
+            "event_id": uuid.uuid4().hex,
+            "source": self.source,
+            "ID": int(student_id),
+            "Name": name,
+            "Class": cls,
+            "Date": date,
+            "Time": time_,
+        }
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                log.warning("Outbox queue full, %d attendance events dropped", self.dropped)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="attendance-outbox",
+                                        daemon=True)
+        self._thread.start()
+
+    def close(self, timeout=SEND_TIMEOUT):
+        """Stop the worker; anything not yet sent stays in the spool file."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        try:
+            self._spool_queued()
+        except OSError:
+            log.exception("Could not spool %d outbox events on close",
+                          len(self._unspooled) + self._queue.qsize())
+
+    # ---------- worker side ----------
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._spool_queued(self._collect_batch())
+                if time.monotonic() >= self._next_attempt:
+                    self._send_pending()
+            except Exception:
+                log.exception("Attendance outbox error, backing off")
+                self._schedule_retry()
+                self._stop.wait(max(0.0, self._next_attempt - time.monotonic()))
+
+    def _collect_batch(self):
+        """Gather up to one batch, waiting at most ``flush_interval``."""
+        events = []
+        # events that failed to reach the disk still count against memory
+        room = min(self.batch_size, self.queue_size - len(self._unspooled))
+        deadline = time.monotonic() + self.flush_interval
+        while len(events) < room and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                events.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        if room <= 0:
+            self._stop.wait(self.flush_interval)
+        return events
+
+    def _spool_queued(self, events=()):
+        self._unspooled.extend(events)
+        while len(self._unspooled) < self.queue_size:
+            try:
+                self._unspooled.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if self._unspooled:
+            self._append_to_spool(self._unspooled)
+            self._unspooled = []
+
+    def _schedule_retry(self):
+        self._backoff = min(BACKOFF_MAX, max(BACKOFF_MIN, self._backoff * 2))
+        self._next_attempt = time.monotonic() + self._backoff * random.uniform(0.5, 1.0)
+
+    # ---------- spool file ----------
+    def _append_to_spool(self, events):
+        data = b"".join(json.dumps(e).encode("utf-8") + b"\n" for e in events)
+        with self._spool_lock:
+            with open(self.spool_file, "ab+") as f:
+                # a crash mid-append leaves an unterminated line; never glue onto it
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_file) as f:
+                offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+        size = os.path.getsize(self.spool_file) if os.path.exists(self.spool_file) else 0
+        return offset if 0 <= offset <= size else 0
+
+    def _write_offset(self, offset):
+        tmp = self.offset_file + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(str(offset))
+        os.replace(tmp, self.offset_file)
+
+    def _read_batch(self):
+        """Return (events, end_offset) for the next unsent batch.
+
+        Unparseable lines at the head of the unsent part, including a final
+        line without its newline, are moved to the .bad file and skipped.
+        """
+        batch = []
+        with self._spool_lock:
+            if not os.path.exists(self.spool_file):
+                return batch, 0
+            offset = self._read_offset()
+            with open(self.spool_file, "rb") as f:
+                f.seek(offset)
+                while len(batch) < self.batch_size:
+                    line = f.readline()
+                    if not line:
+                        break
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("truncated line")
+                        event = json.loads(line)
+                        if not isinstance(event, dict):
+                            raise ValueError("not an event object")
+                    except ValueError:
+                        if batch:
+                            # send what we have; the bad line heads the next batch
+                            offset -= len(line)
+                            break
+                        log.warning("Moving unreadable outbox line to %s", self.bad_file)
+                        self._append_raw(self.bad_file, [line])
+                        self._write_offset(offset)
+                        continue
+                    batch.append(event)
+        return batch, offset
+
+    def _append_raw(self, path, lines):
+        with open(path, "ab") as f:
+            for line in lines:
+                f.write(line.rstrip(b"\r\n") + b"\n")
+
+    def _commit(self, offset):
+        """Mark everything before ``offset`` as delivered, compacting if worthwhile."""
+        with self._spool_lock:
+            size = os.path.getsize(self.spool_file)
+            if offset < size and offset < COMPACT_BYTES:
+                self._write_offset(offset)
+                return
+
+            # offset goes to 0 first: a crash in between only causes resends
+            self._write_offset(0)
+            tmp = self.spool_file + ".tmp"
+            with open(self.spool_file, "rb") as src, open(tmp, "wb") as dst:
+                src.seek(offset)
+                while True:
+                    chunk = src.read(1 << 16)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+            os.replace(tmp, self.spool_file)
+
+    def _send_pending(self):
+        while not self._stop.is_set():
+            batch, end = self._read_batch()
+            if not batch:
+                return
+
+            result = self._post(batch)
+            if result == "retry":
+                self._schedule_retry()
+                return
+            if result == "reject":
+                log.warning("Collector rejected %d events, moved to %s",
+                            len(batch), self.dead_file)
+                self._append_raw(self.dead_file,
+                                 [json.dumps(e).encode("utf-8") for e in batch])
+            self._commit(end)
+            self._backoff = 0.0
+
+    def _post(self, batch):
+        """Send one batch; return "ok", "retry" or "reject"."""
+        body = json.dumps({"events": batch}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return "ok" if 200 <= resp.status < 300 else "retry"
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code not in RETRYABLE_4XX:
+                return "reject"
+            return "retry"
+        except (OSError, ValueError):
+            return "retry"
@@ -0,0 +1,73 @@
+"""Minimal local collector for testing the attendance outbox.
+
+Accepts ``POST {"events": [...]}`` and appends each event to a JSONL file,
+ignoring event IDs it has already stored (the outbox may resend a batch).
+
+    python collector_stub.py --port 8765
+    ATTENDANCE_COLLECTOR_URL=http://127.0.0.1:8765/events python attendance_gui.py
+"""
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    out_file = "collected.jsonl"
+    seen = set()
+    fail = False
+
+    def do_POST(self):
+        if self.fail:
+            self.send_error(503, "collector offline (--fail)")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            events = json.loads(self.rfile.read(length))["events"]
+        except (ValueError, KeyError):
+            self.send_error(400, "expected {\"events\": [...]}")
+            return
+        if self.rejects(events):
+            self.send_error(400, "batch rejected")
+            return
+
+        new = [e for e in events if e.get("event_id") not in self.seen]
+        with open(self.out_file, "a", encoding="utf-8") as f:
+            for e in new:
+                f.write(json.dumps(e) + "\n")
+                self.seen.add(e.get("event_id"))
+
+        print(f"received {len(events)} events ({len(new)} new)")
+        self.send_response(204)
+        self.end_headers()
+
+    def rejects(self, events):
+        """Hook for simulating permanent rejections; accept everything by default."""
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--out", default=CollectorHandler.out_file)
+    parser.add_argument("--fail", action="store_true",
+                        help="answer 503 to everything, to exercise retries")
+    args = parser.parse_args()
+
+    CollectorHandler.out_file = args.out
+    CollectorHandler.fail = args.fail
+    if os.path.exists(args.out):
+        with open(args.out, encoding="utf-8") as f:
+            CollectorHandler.seen = {json.loads(l).get("event_id") for l in f if l.strip()}
+
+    server = HTTPServer((args.host, args.port), CollectorHandler)
+    print(f"Collector listening on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 import cv2
 import os
+from detectors import get_detector
 
 # Create dataset folder if not exists
 if not os.path.exists("dataset"):
     os.makedirs("dataset")
 
-face_cascade = cv2.CascadeClassifier("haarcascade_frontalface_default.xml")
+# Load face detector safely
+try:
+    detector = get_detector(scale_factor=1.3, min_neighbors=5)
+except (IOError, ValueError) as e:
+    print(f"❌ {e}")
+    exit()
 
 cam = cv2.VideoCapture(0)
 
@@ -20,7 +26,7 @@ while True:
         break
 
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+    faces = detector.detect(gray)
 
     for (x, y, w, h) in faces:
         count += 1
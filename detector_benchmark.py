@@ -0,0 +1,155 @@
+"""Compare face detector backends on a labelled set of frames.
+
+The frames directory must contain a ``labels.csv`` with one row per face:
+
+    file,x,y,w,h,ID
+
+``ID`` is optional; when present (and a trained model exists) the end-to-end
+recognition rate is reported too. Frames with no faces can be listed with
+empty box columns so they still count towards speed.
+
+Frames are processed in file-name order. By default they are treated as
+unrelated stills and stateful backends (``haar_fast``) are reset before each
+one; pass ``--sequence`` when they are consecutive video frames so the
+ROI tracking is measured as it runs live.
+
+    python detector_benchmark.py frames/ --backends haar lbp haar_fast
+"""
+import argparse
+import os
+import time
+
+import cv2
+import pandas as pd
+
+from detectors import BACKENDS, get_detector
+from lbph_config import load_model_config, create_recognizer, prepare_face
+
+TRAINER_FILE = os.path.join("trainer", "trainer.yml")
+IOU_MATCH = 0.5
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def load_frames(frames_dir):
+    labels = pd.read_csv(os.path.join(frames_dir, "labels.csv"))
+    has_ids = "ID" in labels.columns
+    frames = []
+
+    for file, rows in labels.groupby("file", sort=True):
+        gray = cv2.imread(os.path.join(frames_dir, file), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            print(f"Skipping unreadable frame: {file}")
+            continue
+
+        truth = []
+        for _, r in rows.dropna(subset=["x", "y", "w", "h"]).iterrows():
+            box = (int(r["x"]), int(r["y"]), int(r["w"]), int(r["h"]))
+            label = int(r["ID"]) if has_ids and not pd.isna(r["ID"]) else None
+            truth.append((box, label))
+        frames.append((file, gray, truth))
+
+    return frames, has_ids
+
+
+def load_recognizer():
+    if not os.path.exists(TRAINER_FILE):
+        return None, None
+    cfg = load_model_config()
+    recognizer = create_recognizer(cfg)
+    recognizer.read(TRAINER_FILE)
+    return recognizer, cfg
+
+
+def run_backend(name, frames, recognizer, cfg, repeat=1, sequence=False):
+    detector = get_detector(name)
+    detected = matched = false_pos = 0
+    recognized = labelled = 0
+    elapsed = 0.0
+
+    for i, (_, gray, truth) in enumerate(frames * repeat):
+        # each pass starts fresh; stills never share state
+        if not sequence or i % len(frames) == 0:
+            detector.reset()
+        start = time.perf_counter()
+        faces = detector.detect(gray)
+        elapsed += time.perf_counter() - start
+        detected += len(faces)
+
+        unmatched = list(faces)
+        for box, label in truth:
+            best = max(unmatched, key=lambda f: iou(box, f), default=None)
+            hit = best is not None and iou(box, best) >= IOU_MATCH
+            if hit:
+                matched += 1
+                unmatched.remove(best)
+
+            if label is None or recognizer is None:
+                continue
+            labelled += 1
+            if hit:
+                x, y, w, h = best
+                id_, conf = recognizer.predict(prepare_face(gray[y:y+h, x:x+w], cfg))
+                if id_ == label and conf < cfg["threshold"]:
+                    recognized += 1
+
+        false_pos += len(unmatched)
+
+    total_faces = repeat * sum(len(t) for _, _, t in frames)
+    n_frames = repeat * len(frames)
+    return {
+        "backend": name,
+        "fps": n_frames / elapsed if elapsed else 0.0,
+        "ms/frame": 1000 * elapsed / n_frames if n_frames else 0.0,
+        "detections/s": detected / elapsed if elapsed else 0.0,
+        "recall": matched / total_faces if total_faces else float("nan"),
+        "false_pos": false_pos,
+        "recognition": recognized / labelled if labelled else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("frames_dir", help="folder with frames and labels.csv")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS),
+                        choices=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="passes over the frames per backend (steadier timings)")
+    parser.add_argument("--sequence", action="store_true",
+                        help="frames are consecutive video frames (keep tracking state)")
+    parser.add_argument("--csv", help="also write the results table here")
+    args = parser.parse_args()
+
+    frames, has_ids = load_frames(args.frames_dir)
+    if not frames:
+        print("No readable frames found.")
+        return
+
+    recognizer, cfg = load_recognizer() if has_ids else (None, None)
+    if has_ids and recognizer is None:
+        print("No trained model found, skipping recognition rate.")
+
+    results = []
+    for name in args.backends:
+        try:
+            results.append(run_backend(name, frames, recognizer, cfg,
+                                       args.repeat, args.sequence))
+        except IOError as e:
+            print(f"WARNING: {name} not benchmarked: {e}")
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False, float_format="%.3f"))
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+import cv2
+
+# ================= CONFIG =================
+HAAR_CASCADE_FILE = "haarcascade_frontalface_default.xml"
+LBP_CASCADE_FILE = "lbpcascade_frontalface_improved.xml"
+# both cascades ship in the repo root; system OpenCV installs are a fallback
+CASCADE_DIRS = [
+    ".",
+    "/usr/share/opencv4/haarcascades",
+    "/usr/share/opencv4/lbpcascades",
+    "/usr/local/share/opencv4/haarcascades",
+    "/usr/local/share/opencv4/lbpcascades",
+]
+
+DEFAULT_BACKEND = os.environ.get("FACE_DETECTOR", "haar")  # per-deployment choice
+DOWNSCALE = 0.5          # frame scale used by the "haar_fast" backend
+ROI_PADDING = 0.5        # extra margin (fraction of box size) kept around last faces
+FULL_SCAN_EVERY = 10     # "haar_fast" rescans the whole frame every N frames
+
+
+def _find_cascade(filename):
+    for folder in CASCADE_DIRS:
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            return path
+    return filename
+
+
+def _load_cascade(filename):
+    path = _find_cascade(filename)
+    cascade = cv2.CascadeClassifier(path)
+    if cascade.empty():
+        raise IOError(f"Cascade not loaded: {filename}")
+    return cascade
+
+
+# ================= BACKENDS =================
+class CascadeDetector:
+    """Plain cascade detection on the full grayscale frame."""
+
+    name = "cascade"
+    cascade_file = None
+
+    def __init__(self, scale_factor=1.2, min_neighbors=5, min_size=None):
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self.cascade = _load_cascade(self.cascade_file)
+
+    def _detect(self, gray, min_size):
+        # min_size None keeps OpenCV's default (the cascade's own window size)
+        extra = {"minSize": min_size} if min_size else {}
+        faces = self.cascade.detectMultiScale(
+            gray, self.scale_factor, self.min_neighbors, **extra
+        )
+        return [tuple(int(v) for v in f) for f in faces]
+
+    def detect(self, gray):
+        """Return a list of (x, y, w, h) boxes in ``gray`` coordinates."""
+        return self._detect(gray, self.min_size)
+
+    def reset(self):
+        """Forget any state carried between frames."""
+        pass
+
+
+class HaarDetector(CascadeDetector):
+    name = "haar"
+    cascade_file = HAAR_CASCADE_FILE
+
+
+class LBPDetector(CascadeDetector):
+    name = "lbp"
+    cascade_file = LBP_CASCADE_FILE
+
+
+class FastHaarDetector(HaarDetector):
+    """Haar on a downscaled frame, searching only around the last known faces.
+
+    The whole (downscaled) frame is scanned when nothing was found on the
+    previous frame or every ``FULL_SCAN_EVERY`` frames, so new faces still
+    get picked up. State is carried between frames, so call ``reset()``
+    whenever the next frame is not a continuation of the previous one.
+    Faces smaller than the cascade window divided by ``downscale`` are missed.
+    """
+
+    name = "haar_fast"
+
+    def __init__(self, scale_factor=1.2, min_neighbors=5, min_size=None,
+                 downscale=DOWNSCALE, roi_padding=ROI_PADDING,
+                 full_scan_every=FULL_SCAN_EVERY):
+        super().__init__(scale_factor, min_neighbors, min_size)
+        self.downscale = downscale
+        self.roi_padding = roi_padding
+        self.full_scan_every = full_scan_every
+        self.reset()
+
+    def reset(self):
+        self._last_faces = []
+        self._frame_no = 0
+
+    def _roi(self, shape):
+        h_img, w_img = shape[:2]
+        x0 = min(x for x, y, w, h in self._last_faces)
+        y0 = min(y for x, y, w, h in self._last_faces)
+        x1 = max(x + w for x, y, w, h in self._last_faces)
+        y1 = max(y + h for x, y, w, h in self._last_faces)
+        pad_x = int((x1 - x0) * self.roi_padding)
+        pad_y = int((y1 - y0) * self.roi_padding)
+        return (max(0, x0 - pad_x), max(0, y0 - pad_y),
+                min(w_img, x1 + pad_x), min(h_img, y1 + pad_y))
+
+    def detect(self, gray):
+        full_scan = not self._last_faces or self._frame_no % self.full_scan_every == 0
+        self._frame_no += 1
+
+        if full_scan:
+            x0, y0, x1, y1 = 0, 0, gray.shape[1], gray.shape[0]
+        else:
+            x0, y0, x1, y1 = self._roi(gray.shape)
+
+        crop = gray[y0:y1, x0:x1]
+        small = cv2.resize(crop, None, fx=self.downscale, fy=self.downscale,
+                           interpolation=cv2.INTER_AREA)
+        min_size = None
+        if self.min_size:
+            min_size = (max(1, int(self.min_size[0] * self.downscale)),
+                        max(1, int(self.min_size[1] * self.downscale)))
+
+        faces = []
+        for (x, y, w, h) in self._detect(small, min_size):
+            faces.append((x0 + int(x / self.downscale), y0 + int(y / self.downscale),
+                          int(w / self.downscale), int(h / self.downscale)))
+
+        self._last_faces = faces
+        return faces
+
+
+BACKENDS = {
+    HaarDetector.name: HaarDetector,
+    LBPDetector.name: LBPDetector,
+    FastHaarDetector.name: FastHaarDetector,
+}
+
+
+def get_detector(name=DEFAULT_BACKEND, **kwargs):
+    """Build the detector backend registered under ``name``."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown detector '{name}', choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,71 @@
+import json
+import os
+
+import cv2
+
+# ================= CONFIG =================
+CONFIG_FILE = "lbph_config.json"
+# copy of the settings trainer.py actually trained trainer/trainer.yml with
+MODEL_CONFIG_FILE = os.path.join("trainer", "trainer_config.json")
+
+# OpenCV's own LBPH defaults, raw (un-resized) crops.
+DEFAULTS = {
+    "radius": 1,
+    "neighbors": 8,
+    "grid_x": 8,
+    "grid_y": 8,
+    "crop_size": None,   # side in pixels, None keeps detector crops as-is
+    "threshold": 65,     # accept a prediction when confidence is below this
+}
+
+
+def load_config(path=CONFIG_FILE):
+    """Return the tuned LBPH settings, falling back to DEFAULTS."""
+    cfg = dict(DEFAULTS)
+    if not os.path.exists(path):
+        return cfg
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+    except (OSError, ValueError) as e:
+        print(f"⚠ Ignoring unreadable {path} ({e}), using default LBPH settings")
+        return cfg
+    cfg.update({k: v for k, v in data.items() if k in DEFAULTS})
+    return cfg
+
+
+def load_model_config(path=MODEL_CONFIG_FILE):
+    """Return the settings the current model was trained with.
+
+    Recognition must use these rather than lbph_config.json, which may have
+    been re-tuned since the last training run. Models trained before this
+    file existed used DEFAULTS.
+    """
+    return load_config(path)
+
+
+def config_pending_retrain(model_cfg, path=CONFIG_FILE):
+    """True when lbph_config.json differs from what the model was trained with."""
+    return os.path.exists(path) and load_config(path) != model_cfg
+
+
+def save_config(cfg, path=CONFIG_FILE):
+    with open(path, "w") as f:
+        json.dump({k: cfg[k] for k in DEFAULTS}, f, indent=2)
+
+
+def create_recognizer(cfg):
+    return cv2.face.LBPHFaceRecognizer_create(
+        radius=cfg["radius"], neighbors=cfg["neighbors"],
+        grid_x=cfg["grid_x"], grid_y=cfg["grid_y"]
+    )
+
+
+def prepare_face(gray_face, cfg):
+    """Normalize a grayscale face crop to the configured size."""
+    size = cfg["crop_size"]
+    if not size:
+        return gray_face
+    return cv2.resize(gray_face, (size, size), interpolation=cv2.INTER_AREA)
@@ -0,0 +1,183 @@
+"""Sweep LBPH parameters, crop size and threshold over the dataset.
+
+Images in ``dataset/`` are split per student into train and holdout sets.
+A few students can be kept out of training entirely (``--unknown``) so the
+holdout also contains faces the model has never seen. Every combination is
+trained once; thresholds are then swept over the recorded confidences.
+
+Two error rates are reported separately: ``far`` is the share of impostor
+(never trained) probes that get accepted, ``misid`` the share of enrolled
+students accepted under the wrong ID. The best configuration (highest
+accuracy within ``--max-far`` and ``--max-misid``, then lowest predict
+latency) is written to lbph_config.json. Attendance keeps using the settings
+the current model was trained with until trainer.py is run again.
+
+    python lbph_tuning.py --crop-sizes 0 64 100 --grids 4 6 8
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from lbph_config import CONFIG_FILE, create_recognizer, prepare_face, save_config
+from trainer import getImagesAndLabels
+
+DATASET_DIR = "dataset"
+
+
+def split_dataset(faces, ids, holdout, unknown, seed):
+    by_id = {}
+    for face, id_ in zip(faces, ids):
+        by_id.setdefault(id_, []).append(face)
+
+    rng = random.Random(seed)
+    all_ids = sorted(by_id)
+    unknown_ids = set(rng.sample(all_ids, max(0, min(unknown, len(all_ids) - 1))))
+
+    train, probes = [], []
+    for id_ in all_ids:
+        samples = by_id[id_][:]
+        rng.shuffle(samples)
+        if id_ in unknown_ids:
+            probes += [(s, id_, False) for s in samples]
+            continue
+        # a student with one image can only be trained on, never probed
+        n_hold = 0
+        if len(samples) >= 2:
+            n_hold = min(len(samples) - 1, max(1, int(len(samples) * holdout)))
+        probes += [(s, id_, True) for s in samples[:n_hold]]
+        train += [(s, id_) for s in samples[n_hold:]]
+
+    return train, probes
+
+
+def evaluate(cfg, train, probes):
+    recognizer = create_recognizer(cfg)
+    recognizer.train([prepare_face(f, cfg) for f, _ in train],
+                     np.array([id_ for _, id_ in train]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.yml")
+        recognizer.save(model_path)
+        model_size = os.path.getsize(model_path)
+
+    # crops are normalized outside the timed region, as in the frame loop
+    prepared = [(prepare_face(f, cfg), id_, known) for f, id_, known in probes]
+    predictions = []
+    elapsed = 0.0
+    for face, id_, known in prepared:
+        start = time.perf_counter()
+        pred, conf = recognizer.predict(face)
+        elapsed += time.perf_counter() - start
+        predictions.append((pred, conf, id_, known))
+
+    return predictions, 1000 * elapsed / len(prepared), model_size
+
+
+def score(predictions, threshold):
+    """Return (accuracy, misid, far) at ``threshold``; far is NaN without impostors."""
+    known = [p for p in predictions if p[3]]
+    impostors = [p for p in predictions if not p[3]]
+    correct = sum(1 for pred, conf, id_, _ in known if conf < threshold and pred == id_)
+    misidentified = sum(1 for pred, conf, id_, _ in known if conf < threshold and pred != id_)
+    accepted = sum(1 for _, conf, _, _ in impostors if conf < threshold)
+
+    accuracy = correct / len(known) if known else 0.0
+    misid = misidentified / len(known) if known else 0.0
+    far = accepted / len(impostors) if impostors else float("nan")
+    return accuracy, misid, far
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default=DATASET_DIR)
+    parser.add_argument("--radii", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--neighbors", type=int, nargs="+", default=[8])
+    parser.add_argument("--grids", type=int, nargs="+", default=[4, 6, 8],
+                        help="square grid sizes (grid_x = grid_y)")
+    parser.add_argument("--crop-sizes", type=int, nargs="+", default=[0, 64, 100],
+                        help="normalized crop side in pixels, 0 keeps raw crops")
+    parser.add_argument("--thresholds", type=int, nargs="+",
+                        default=list(range(40, 101, 5)))
+    parser.add_argument("--holdout", type=float, default=0.25,
+                        help="fraction of each student's images held out")
+    parser.add_argument("--unknown", type=int, default=1,
+                        help="students left out of training as impostors")
+    parser.add_argument("--max-far", type=float, default=0.01,
+                        help="highest acceptable impostor false-accept rate")
+    parser.add_argument("--max-misid", type=float, default=0.01,
+                        help="highest acceptable rate of enrolled students given the wrong ID")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="also write every result row here")
+    parser.add_argument("--dry-run", action="store_true",
+                        help=f"report only, do not write {CONFIG_FILE}")
+    args = parser.parse_args()
+
+    faces, ids = getImagesAndLabels(args.dataset)
+    train, probes = split_dataset(faces, ids, args.holdout, args.unknown, args.seed)
+    if not train or not probes:
+        print("Not enough images in the dataset to tune.")
+        return
+    n_impostors = sum(1 for _, _, known in probes if not known)
+    print(f"{len(train)} training images, {len(probes)} holdout images "
+          f"({n_impostors} impostor)")
+    if not n_impostors:
+        print("No impostor probes (need --unknown and 2+ students), FAR not measured.")
+
+    rows = []
+    for radius, neighbors, grid, crop in itertools.product(
+            args.radii, args.neighbors, args.grids, args.crop_sizes):
+        cfg = {"radius": radius, "neighbors": neighbors, "grid_x": grid,
+               "grid_y": grid, "crop_size": crop or None}
+        predictions, latency_ms, model_size = evaluate(cfg, train, probes)
+
+        for threshold in args.thresholds:
+            accuracy, misid, far = score(predictions, threshold)
+            rows.append({**cfg, "threshold": threshold, "accuracy": accuracy,
+                         "misid": misid, "far": far, "predict_ms": latency_ms,
+                         "model_kb": model_size / 1024})
+
+    df = pd.DataFrame(rows)
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+
+    far_ok = df["far"].isna() | (df["far"] <= args.max_far)
+    ok = df[far_ok & (df["misid"] <= args.max_misid)]
+    if ok.empty:
+        print(f"No configuration reaches FAR <= {args.max_far} and misid <= "
+              f"{args.max_misid}, using the lowest error rates.")
+        best = df.sort_values(["far", "misid", "accuracy", "predict_ms"],
+                              ascending=[True, True, False, True]).iloc[0]
+    else:
+        best = ok.sort_values(["accuracy", "predict_ms"],
+                              ascending=[False, True]).iloc[0]
+
+    top = df.sort_values(["accuracy", "far", "misid"],
+                         ascending=[False, True, True]).head(10)
+    print(top.to_string(index=False, float_format="%.3f"))
+
+    cfg = {
+        "radius": int(best["radius"]),
+        "neighbors": int(best["neighbors"]),
+        "grid_x": int(best["grid_x"]),
+        "grid_y": int(best["grid_y"]),
+        "crop_size": None if pd.isna(best["crop_size"]) else int(best["crop_size"]),
+        "threshold": int(best["threshold"]),
+    }
+    print(f"\nBest: {cfg}  accuracy={best['accuracy']:.3f} "
+          f"misid={best['misid']:.3f} far={best['far']:.3f} "
+          f"predict={best['predict_ms']:.3f}ms model={best['model_kb']:.0f}KB")
+
+    if not args.dry_run:
+        save_config(cfg)
+        print(f"Saved to {CONFIG_FILE}. It takes effect after trainer.py retrains the "
+              f"model; until then attendance keeps the settings the model was trained with.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import HTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import attendance_outbox  # noqa: E402
+from attendance_outbox import AttendanceOutbox  # noqa: E402
+from collector_stub import CollectorHandler  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(cond, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.05)
+    return cond()
+
+
+def read_lines(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        return [l for l in f.read().splitlines() if l.strip()]
+
+
+class OutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.spool = os.path.join(self.tmp, "outbox.jsonl")
+        self.collected = os.path.join(self.tmp, "collected.jsonl")
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}/events"
+        self.server = None
+        self.outboxes = []
+
+        self._saved = (attendance_outbox.BACKOFF_MIN, attendance_outbox.BACKOFF_MAX)
+        attendance_outbox.BACKOFF_MIN = 0.05
+        attendance_outbox.BACKOFF_MAX = 0.2
+
+    def tearDown(self):
+        for ob in self.outboxes:
+            ob.close()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        attendance_outbox.BACKOFF_MIN, attendance_outbox.BACKOFF_MAX = self._saved
+        shutil.rmtree(self.tmp)
+
+    def start_collector(self, reject=None):
+        class Handler(CollectorHandler):
+            out_file = self.collected
+            seen = set()
+
+            def rejects(h, events):
+                return reject is not None and any(reject(e) for e in events)
+
+            def log_message(h, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", self.port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def outbox(self, **kwargs):
+        kwargs.setdefault("flush_interval", 0.05)
+        kwargs.setdefault("timeout", 1.0)
+        ob = AttendanceOutbox(self.url, spool_file=self.spool, **kwargs)
+        self.outboxes.append(ob)
+        return ob
+
+    def collected_ids(self):
+        return [json.loads(l)["event_id"] for l in read_lines(self.collected)]
+
+    def publish(self, ob, n, name="Student"):
+        for i in range(n):
+            ob.publish(i, name, "General", "01-01-2026", "09:00:00")
+
+    def test_delivers_after_collector_comes_back(self):
+        ob = self.outbox(batch_size=10)
+        ob.start()
+        self.publish(ob, 25)
+        self.assertTrue(wait_for(lambda: len(read_lines(self.spool)) == 25))
+        self.assertEqual(self.collected_ids(), [])
+
+        self.start_collector()
+        self.assertTrue(wait_for(lambda: len(self.collected_ids()) == 25))
+        self.assertTrue(ob._thread.is_alive())
+
+    def test_no_loss_across_close_and_restart(self):
+        ob = self.outbox()
+        ob.start()
+        self.publish(ob, 7)
+        ob.close()
+        spooled = {json.loads(l)["event_id"] for l in read_lines(self.spool)}
+        self.assertEqual(len(spooled), 7)
+
+        self.start_collector()
+        ob2 = self.outbox()
+        ob2.start()
+        self.assertTrue(wait_for(lambda: set(self.collected_ids()) == spooled))
+
+    def test_recovers_from_truncated_spool_line(self):
+        good = {"event_id": "good", "ID": 1}
+        with open(self.spool, "wb") as f:
+            f.write(json.dumps(good).encode() + b"\n")
+            f.write(b'{"event_id": "trunc')    # crash mid-append
+
+        self.start_collector()
+        ob = self.outbox()
+        ob.start()
+        self.publish(ob, 1)
+        self.assertTrue(wait_for(lambda: len(self.collected_ids()) == 2))
+        self.assertIn("good", self.collected_ids())
+        self.assertEqual(read_lines(ob.bad_file), [b'{"event_id": "trunc'])
+        self.assertTrue(ob._thread.is_alive())
+
+    def test_full_queue_drops_without_blocking(self):
+        ob = self.outbox(queue_size=5)
+        start = time.perf_counter()
+        self.publish(ob, 8)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(ob.dropped, 3)
+        self.assertFalse(os.path.exists(self.spool))
+
+        self.start_collector()
+        ob.start()
+        self.assertTrue(wait_for(lambda: len(self.collected_ids()) == 5))
+
+    def test_rejected_batch_is_dead_lettered(self):
+        self.start_collector(reject=lambda e: e.get("Name") == "bad")
+        ob = self.outbox(batch_size=1)
+        self.publish(ob, 1, name="bad")
+        self.publish(ob, 3)
+        ob.start()
+        self.assertTrue(wait_for(lambda: len(self.collected_ids()) == 3))
+        dead = [json.loads(l) for l in read_lines(ob.dead_file)]
+        self.assertEqual([e["Name"] for e in dead], ["bad"])
+
+    def test_spool_write_error_does_not_kill_worker(self):
+        os.makedirs(self.spool)   # open() on the spool now fails
+        ob = self.outbox()
+        ob.start()
+        self.publish(ob, 3)
+        time.sleep(0.3)
+        self.assertTrue(ob._thread.is_alive())
+        self.assertEqual(len(ob._unspooled), 3)
+
+    def test_sent_batches_advance_offset_without_rewriting(self):
+        self.start_collector()
+        ob = self.outbox(batch_size=5)
+        self.publish(ob, 6)
+        ob._spool_queued()
+        inode = os.stat(self.spool).st_ino
+
+        batch, end = ob._read_batch()
+        self.assertEqual(ob._post(batch), "ok")
+        ob._commit(end)
+        self.assertEqual(os.stat(self.spool).st_ino, inode)
+        with open(ob.offset_file) as f:
+            self.assertEqual(int(f.read()), end)
+
+        # the rest is sent from the offset, and a fully sent spool is compacted
+        ob._send_pending()
+        self.assertEqual(len(set(self.collected_ids())), 6)
+        self.assertEqual(read_lines(self.spool), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
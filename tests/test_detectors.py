@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import detector_benchmark  # noqa: E402
+from detectors import FastHaarDetector, get_detector  # noqa: E402
+
+
+class FastHaarDetectorTest(unittest.TestCase):
+    def setUp(self):
+        # cascades are looked up relative to the working directory, like the scripts do
+        self._cwd = os.getcwd()
+        os.chdir(ROOT)
+        self.det = FastHaarDetector(downscale=0.5, roi_padding=0.5, full_scan_every=10)
+        self.calls = []
+        self.small_faces = []
+
+        def fake_detect(gray, min_size):
+            self.calls.append(gray.shape)
+            return list(self.small_faces)
+
+        self.det._detect = fake_detect
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+
+    def test_roi_pads_union_of_last_faces_and_clips_to_frame(self):
+        self.det._last_faces = [(100, 100, 40, 40), (160, 120, 40, 40)]
+        # union is x 100..200, y 100..160; padding is half of that size
+        self.assertEqual(self.det._roi((480, 640)), (50, 70, 250, 190))
+
+        self.det._last_faces = [(0, 0, 100, 100)]
+        self.assertEqual(self.det._roi((120, 120)), (0, 0, 120, 120))
+
+    def test_boxes_are_mapped_back_to_frame_coordinates(self):
+        gray = np.zeros((480, 640), np.uint8)
+        self.small_faces = [(10, 20, 30, 30)]
+        self.assertEqual(self.det.detect(gray), [(20, 40, 60, 60)])
+        self.assertEqual(self.calls[-1], (240, 320))
+
+        # second frame searches only the padded ROI (x 0..110, y 10..130)
+        self.small_faces = [(5, 5, 30, 30)]
+        self.assertEqual(self.det.detect(gray), [(10, 20, 60, 60)])
+        self.assertEqual(self.calls[-1], (60, 55))
+
+    def test_reset_forces_full_scan(self):
+        gray = np.zeros((480, 640), np.uint8)
+        self.small_faces = [(10, 20, 30, 30)]
+        self.det.detect(gray)
+        self.det.detect(gray)
+        self.assertNotEqual(self.calls[-1], (240, 320))
+
+        self.det.reset()
+        self.det.detect(gray)
+        self.assertEqual(self.calls[-1], (240, 320))
+
+    def test_periodic_full_scan(self):
+        gray = np.zeros((480, 640), np.uint8)
+        self.small_faces = [(10, 20, 30, 30)]
+        for _ in range(11):
+            self.det.detect(gray)
+        self.assertEqual(self.calls.count((240, 320)), 2)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_detector("nope")
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_iou(self):
+        iou = detector_benchmark.iou
+        self.assertEqual(iou((0, 0, 10, 10), (0, 0, 10, 10)), 1.0)
+        self.assertEqual(iou((0, 0, 10, 10), (20, 20, 10, 10)), 0.0)
+        self.assertAlmostEqual(iou((0, 0, 10, 10), (5, 0, 10, 10)), 50 / 150)
+        self.assertEqual(iou((0, 0, 0, 0), (0, 0, 0, 0)), 0.0)
+
+    def run_with_fake(self, sequence, repeat):
+        fake = mock.Mock()
+        fake.detect.return_value = [(0, 0, 10, 10)]
+        frames = [(f"f{i}", np.zeros((20, 20), np.uint8), [((0, 0, 10, 10), None)])
+                  for i in range(3)]
+        with mock.patch.object(detector_benchmark, "get_detector", return_value=fake):
+            result = detector_benchmark.run_backend("fake", frames, None, None,
+                                                    repeat, sequence)
+        return fake, result
+
+    def test_stills_reset_before_every_frame(self):
+        fake, result = self.run_with_fake(sequence=False, repeat=2)
+        self.assertEqual(fake.reset.call_count, 6)
+        self.assertEqual(fake.detect.call_count, 6)
+        self.assertEqual(result["recall"], 1.0)
+
+    def test_sequence_resets_once_per_pass(self):
+        fake, _ = self.run_with_fake(sequence=True, repeat=2)
+        self.assertEqual(fake.reset.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import math
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lbph_tuning import score, split_dataset  # noqa: E402
+
+
+def faces_for(counts):
+    """Synthetic dataset: ``counts`` maps student ID to number of images."""
+    faces, ids = [], []
+    for id_, n in counts.items():
+        for k in range(n):
+            faces.append(np.full((4, 4), k, np.uint8))
+            ids.append(id_)
+    return faces, ids
+
+
+class SplitDatasetTest(unittest.TestCase):
+    def test_one_image_student_is_only_trained(self):
+        faces, ids = faces_for({1: 1, 2: 8})
+        train, probes = split_dataset(faces, ids, holdout=0.25, unknown=0, seed=0)
+        self.assertEqual([id_ for _, id_ in train].count(1), 1)
+        self.assertNotIn(1, [id_ for _, id_, _ in probes])
+
+    def test_known_students_keep_a_training_image(self):
+        faces, ids = faces_for({1: 2, 2: 3})
+        train, probes = split_dataset(faces, ids, holdout=0.9, unknown=0, seed=0)
+        train_ids = [id_ for _, id_ in train]
+        self.assertEqual(train_ids.count(1), 1)
+        self.assertEqual(train_ids.count(2), 1)
+        self.assertTrue(all(known for _, _, known in probes))
+
+    def test_unknown_students_never_trained(self):
+        faces, ids = faces_for({1: 5, 2: 5, 3: 5, 4: 5})
+        for seed in range(5):
+            train, probes = split_dataset(faces, ids, holdout=0.25, unknown=2, seed=seed)
+            impostors = {id_ for _, id_, known in probes if not known}
+            self.assertEqual(len(impostors), 2)
+            self.assertFalse(impostors & {id_ for _, id_ in train})
+            # every image of an impostor is a probe
+            self.assertEqual(sum(1 for _, _, known in probes if not known), 10)
+
+    def test_unknown_never_takes_the_last_student(self):
+        faces, ids = faces_for({1: 4})
+        train, probes = split_dataset(faces, ids, holdout=0.25, unknown=1, seed=0)
+        self.assertTrue(train)
+        self.assertTrue(all(known for _, _, known in probes))
+
+
+class ScoreTest(unittest.TestCase):
+    # (predicted ID, confidence, true ID, known)
+    PREDICTIONS = [
+        (1, 30, 1, True),    # accepted, correct
+        (2, 40, 1, True),    # accepted, wrong ID -> misid
+        (1, 90, 1, True),    # rejected
+        (3, 50, 3, True),    # accepted, correct
+        (1, 45, 9, False),   # impostor accepted -> false accept
+        (2, 95, 9, False),   # impostor rejected
+    ]
+
+    def test_far_counts_only_impostors(self):
+        accuracy, misid, far = score(self.PREDICTIONS, threshold=60)
+        self.assertEqual(accuracy, 2 / 4)
+        self.assertEqual(misid, 1 / 4)
+        self.assertEqual(far, 1 / 2)
+
+    def test_threshold_moves_all_rates(self):
+        accuracy, misid, far = score(self.PREDICTIONS, threshold=42)
+        self.assertEqual((accuracy, misid, far), (1 / 4, 1 / 4, 0.0))
+
+    def test_far_is_nan_without_impostors(self):
+        known_only = [p for p in self.PREDICTIONS if p[3]]
+        accuracy, misid, far = score(known_only, threshold=60)
+        self.assertEqual(misid, 1 / 4)
+        self.assertTrue(math.isnan(far))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,8 @@ import cv2
 import numpy as np
 from PIL import Image
 import os
+from lbph_config import load_config, save_config, create_recognizer, prepare_face, MODEL_CONFIG_FILE
 
-recognizer = cv2.face.LBPHFaceRecognizer_create()
 path = "dataset"
 
 def getImagesAndLabels(path):
@@ -21,13 +21,19 @@ def getImagesAndLabels(path):
 
     return face_samples, ids
 
-faces, ids = getImagesAndLabels(path)
+if __name__ == "__main__":
+    cfg = load_config()
+    recognizer = create_recognizer(cfg)
 
-recognizer.train(faces, np.array(ids))
+    faces, ids = getImagesAndLabels(path)
+    faces = [prepare_face(f, cfg) for f in faces]
 
-if not os.path.exists("trainer"):
-    os.makedirs("trainer")
+    recognizer.train(faces, np.array(ids))
 
-recognizer.save("trainer/trainer.yml")
+    if not os.path.exists("trainer"):
+        os.makedirs("trainer")
 
-print("Model training completed!")
+    recognizer.save("trainer/trainer.yml")
+    save_config(cfg, MODEL_CONFIG_FILE)
+
+    print("Model training completed!")